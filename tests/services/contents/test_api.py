@@ -1,5 +1,6 @@
 import sys
 import json
+import asyncio
 import pathlib
 import pytest
 from urllib.parse import ParseResult, urlunparse
@@ -8,7 +9,7 @@ import tornado
 
 from nbformat import writes, from_dict
 from nbformat.v4 import (
-    new_notebook, new_markdown_cell,
+    new_notebook, new_markdown_cell, new_code_cell,
 )
 
 from jupyter_server.utils import url_path_join
@@ -103,6 +104,59 @@ async def test_get_dir_no_contents(fetch, contents, path, name):
     assert model['content'] == None
 
 
+async def test_list_large_dir(fetch, contents, contents_dir):
+    big_dir = contents_dir / 'big'
+    big_dir.mkdir()
+    names = ['file{:04d}.txt'.format(i) for i in range(1000)]
+    for name in names:
+        big_dir.joinpath(name).write_text(name)
+
+    response = await fetch(
+        'api', 'contents', 'big',
+        method='GET',
+    )
+    model = json.loads(response.body)
+    listing = model['content']
+    # Every entry is listed exactly once.
+    assert len(listing) == len(names)
+    assert sorted(entry['name'] for entry in listing) == names
+    assert all(entry['path'] == 'big/' + entry['name'] for entry in listing)
+    assert all(entry['content'] is None for entry in listing)
+
+
+async def test_list_hidden(fetch, serverapp, contents, contents_dir):
+    contents_dir.joinpath('.hidden dir').mkdir()
+    contents_dir.joinpath('.hidden dir', 'x.txt').write_text('x')
+    contents_dir.joinpath('foo', '.hidden.txt').write_text('hidden')
+    contents_dir.joinpath('foo', 'cache.pyc').write_bytes(b'\x00')
+
+    async def listing(path):
+        r = await fetch(
+            'api', 'contents', path,
+            method='GET'
+        )
+        return [entry['name'] for entry in json.loads(r.body)['content']]
+
+    names = await listing('foo')
+    assert 'a.txt' in names
+    assert '.hidden.txt' not in names
+    assert 'cache.pyc' not in names
+    assert '.hidden dir' not in await listing('')
+    with pytest.raises(tornado.httpclient.HTTPClientError) as e:
+        await listing('.hidden dir')
+    assert expected_http_error(e, 404)
+
+    serverapp.contents_manager.allow_hidden = True
+    names = await listing('foo')
+    assert '.hidden.txt' in names
+    assert 'cache.pyc' not in names
+    assert '.hidden dir' in await listing('')
+    assert await listing('.hidden dir') == ['x.txt']
+
+    serverapp.contents_manager.hide_globs = []
+    assert 'cache.pyc' in await listing('foo')
+
+
 async def test_list_nonexistant_dir(fetch, contents):
     with pytest.raises(tornado.httpclient.HTTPClientError):
         await fetch(
@@ -170,6 +224,63 @@ async def test_get_nb_invalid(contents_dir, fetch, contents):
     assert 'validation failed' in model['message'].lower()
 
 
+async def test_get_nb_upgrades_format(contents_dir, fetch, contents):
+    nb = {
+        'nbformat': 3,
+        'nbformat_minor': 0,
+        'metadata': {'name': ''},
+        'worksheets': [{
+            'metadata': {},
+            'cells': [{
+                'cell_type': 'markdown',
+                'metadata': {},
+                'source': 'Old format',
+            }],
+        }],
+    }
+    nbpath = u'å b/Old tést.ipynb'
+    (contents_dir / nbpath).write_text(json.dumps(nb))
+    r = await fetch(
+        'api', 'contents', nbpath,
+        method='GET',
+    )
+    model = json.loads(r.body)
+    assert model['type'] == 'notebook'
+    assert model['content']['nbformat'] == 4
+    assert model['content']['cells'][0]['source'] == 'Old format'
+
+
+async def test_get_nb_marks_untrusted_cells(contents_dir, fetch, contents):
+    nb = new_notebook(cells=[new_code_cell("print('hi')")])
+    nbpath = u'å b/Untrusted tést.ipynb'
+    (contents_dir / nbpath).write_text(writes(nb, version=4), encoding='utf-8')
+    r = await fetch(
+        'api', 'contents', nbpath,
+        method='GET',
+    )
+    model = json.loads(r.body)
+    cell = model['content']['cells'][0]
+    assert cell['metadata']['trusted'] is False
+
+
+async def test_get_nb_not_modified(fetch, contents):
+    r = await fetch(
+        'api', 'contents', 'foo/a.ipynb',
+        method='GET',
+    )
+    etag = r.headers['Etag']
+    assert 'Last-Modified' in r.headers
+
+    r = await fetch(
+        'api', 'contents', 'foo/a.ipynb',
+        method='GET',
+        headers={'If-None-Match': etag},
+        raise_error=False
+    )
+    assert r.code == 304
+    assert r.body == b''
+
+
 async def test_get_contents_no_such_file(fetch):
     with pytest.raises(tornado.httpclient.HTTPClientError) as e:
         await fetch(
@@ -243,6 +354,35 @@ async def test_get_binary_file_contents(fetch, contents, path, name):
     assert expected_http_error(e, 404)
 
 
+@pytest.mark.parametrize('path,name', dirs)
+async def test_get_text_file_as_base64(fetch, contents, path, name):
+    txtname = name+'.txt'
+    txtpath = (path + '/' + txtname).lstrip('/')
+    r = await fetch(
+        'api', 'contents', txtpath,
+        method='GET',
+        params=dict(
+            type='file',
+            format='base64'
+        )
+    )
+    model = json.loads(r.body)
+    assert model['format'] == 'base64'
+    assert model['mimetype'] == 'text/plain'
+    data_out = decodebytes(model['content'].encode('ascii'))
+    assert data_out == '{} text file'.format(name).encode('utf-8')
+
+
+async def test_get_bad_format(fetch, contents):
+    with pytest.raises(tornado.httpclient.HTTPClientError) as e:
+        await fetch(
+            'api', 'contents', 'foo/a.blob',
+            method='GET',
+            params=dict(format='binary')
+        )
+    assert expected_http_error(e, 400, "Format 'binary' is invalid")
+
+
 async def test_get_bad_type(fetch, contents):
     with pytest.raises(tornado.httpclient.HTTPClientError) as e:
         path = 'unicodé'
@@ -446,6 +586,89 @@ async def test_upload_b64(fetch, contents, contents_dir):
     assert decoded == body
 
 
+async def test_upload_b64_all_bytes(fetch, contents, contents_dir):
+    body = bytes(range(256)) * 64
+    model = {
+        'content' : encodebytes(body).decode('ascii'),
+        'format'  : 'base64',
+        'type'    : 'file',
+    }
+    path = 'å b'
+    name = 'All bytes.blob'
+    await fetch(
+        'api', 'contents', path, name,
+        method='PUT',
+        body=json.dumps(model)
+    )
+    assert (contents_dir / path / name).read_bytes() == body
+
+    r = await fetch(
+        'api', 'contents', path, name,
+        method='GET'
+    )
+    model = json.loads(r.body)
+    assert model['format'] == 'base64'
+    assert model['mimetype'] == 'application/octet-stream'
+    assert decodebytes(model['content'].encode('ascii')) == body
+
+
+async def test_upload_chunked(fetch, contents, contents_dir):
+    chunks = [b'\xff' * 1024, bytes(range(256)), b'last chunk']
+    path = 'å b'
+    name = 'Chunked tést.blob'
+    for i, data in enumerate(chunks, 1):
+        model = {
+            'content' : encodebytes(data).decode('ascii'),
+            'format'  : 'base64',
+            'type'    : 'file',
+            'chunk'   : -1 if i == len(chunks) else i,
+        }
+        r = await fetch(
+            'api', 'contents', path, name,
+            method='PUT',
+            body=json.dumps(model)
+        )
+        assert r.code == (201 if i == 1 else 200)
+        model = json.loads(r.body)
+        assert model['path'] == path+'/'+name
+        assert 'chunk' not in model
+
+    assert (contents_dir / path / name).read_bytes() == b''.join(chunks)
+
+
+async def test_upload_same_content_twice(fetch, contents, contents_dir):
+    body = b'\xFFshared blob'
+    paths = ['å b/shared.blob', 'foo/bar/shared.blob']
+    for path in paths:
+        await fetch(
+            'api', 'contents', path,
+            method='PUT',
+            body=json.dumps({
+                'content' : encodebytes(body).decode('ascii'),
+                'format'  : 'base64',
+                'type'    : 'file',
+            })
+        )
+
+    # Overwriting one copy must leave the other untouched.
+    await fetch(
+        'api', 'contents', paths[0],
+        method='PUT',
+        body=json.dumps({
+            'content' : encodebytes(b'\xFFchanged').decode('ascii'),
+            'format'  : 'base64',
+            'type'    : 'file',
+        })
+    )
+    r = await fetch(
+        'api', 'contents', paths[1],
+        method='GET'
+    )
+    model = json.loads(r.body)
+    assert decodebytes(model['content'].encode('ascii')) == body
+    assert (contents_dir / paths[0]).read_bytes() == b'\xFFchanged'
+
+
 async def test_copy(fetch, contents, contents_dir):
     path = 'å b'
     name = 'ç d.ipynb'
@@ -686,6 +909,33 @@ async def test_save(fetch, contents):
     assert newnb.cells[0].source == 'Created by test ³'
 
 
+async def test_save_concurrent(fetch, contents):
+    paths = ['foo/concurrent{}.txt'.format(i) for i in range(20)]
+    await asyncio.gather(*[
+        fetch(
+            'api', 'contents', path,
+            method='PUT',
+            body=json.dumps({
+                'content': path,
+                'format': 'text',
+                'type': 'file',
+            })
+        )
+        for path in paths
+    ])
+    responses = await asyncio.gather(*[
+        fetch(
+            'api', 'contents', path,
+            method='GET'
+        )
+        for path in paths
+    ])
+    for path, r in zip(paths, responses):
+        model = json.loads(r.body)
+        assert model['path'] == path
+        assert model['content'] == path
+
+
 async def test_checkpoints(fetch, contents):
     path = 'foo/a.ipynb'
     resp = await fetch(
@@ -764,6 +1014,75 @@ async def test_checkpoints(fetch, contents):
     assert cps == []
 
 
+async def test_checkpoint_created_on_upload(fetch, contents):
+    path = 'foo/new.ipynb'
+    nbmodel = {'content': new_notebook(), 'type': 'notebook'}
+    r = await fetch(
+        'api', 'contents', path,
+        method='PUT',
+        body=json.dumps(nbmodel)
+    )
+    assert r.code == 201
+
+    # One checkpoint always exists for notebooks once the save returns.
+    r = await fetch(
+        'api', 'contents', path, 'checkpoints',
+        method='GET'
+    )
+    cps = json.loads(r.body)
+    assert len(cps) == 1
+
+
+async def test_checkpoints_restore_latest(fetch, contents):
+    path = 'foo/a.txt'
+
+    async def save(content):
+        await fetch(
+            'api', 'contents', path,
+            method='PUT',
+            body=json.dumps({
+                'content': content,
+                'type': 'file',
+                'format': 'text',
+            })
+        )
+
+    async def create_checkpoint():
+        r = await fetch(
+            'api', 'contents', path, 'checkpoints',
+            method='POST',
+            allow_nonstandard_methods=True
+        )
+        return json.loads(r.body)
+
+    await save('version 1')
+    await create_checkpoint()
+    await save('version 2')
+    cp2 = await create_checkpoint()
+    await save('version 3')
+
+    r = await fetch(
+        'api', 'contents', path, 'checkpoints',
+        method='GET'
+    )
+    cps = json.loads(r.body)
+    assert cp2 in cps
+
+    # The most recent checkpoint holds the most recent snapshot.
+    r = await fetch(
+        'api', 'contents', path, 'checkpoints', cp2['id'],
+        method='POST',
+        allow_nonstandard_methods=True
+    )
+    assert r.code == 204
+
+    r = await fetch(
+        'api', 'contents', path,
+        method='GET'
+    )
+    assert json.loads(r.body)['content'] == 'version 2'
+
+
 async def test_file_checkpoints(fetch, contents):
     path = 'foo/a.txt'
     resp = await fetch(
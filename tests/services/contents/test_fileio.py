@@ -134,4 +134,43 @@ def test_atomic_writing_newlines(tmp_path):
         f.write(text)
     with io.open(path, 'r', newline='') as f:
         read = f.read()
-    assert read == text
\ No newline at end of file
+    assert read == text
+
+
+def test_atomic_writing_no_leftovers(tmp_path):
+    class CustomExc(Exception): pass
+
+    f1 = tmp_path / 'penguin'
+    f1.write_text('Before')
+
+    with atomic_writing(str(f1)) as f:
+        f.write('Overwritten')
+    assert os.listdir(str(tmp_path)) == ['penguin']
+
+    with pytest.raises(CustomExc):
+        with atomic_writing(str(f1)) as f:
+            f.write('Failing write')
+            raise CustomExc
+    assert os.listdir(str(tmp_path)) == ['penguin']
+
+    with io.open(f1, 'r') as f:
+        assert f.read() == 'Overwritten'
+
+
+def test_atomic_writing_binary(tmp_path):
+    f1 = tmp_path / 'blob'
+    data = bytes(range(256))
+    with atomic_writing(str(f1), text=False) as f:
+        f.write(data)
+    assert f1.read_bytes() == data
+
+
+def test_atomic_writing_repeated(tmp_path):
+    # Every write must be complete and visible as soon as the
+    # context exits, however quickly the next one follows.
+    f1 = tmp_path / 'autosave'
+    for i in range(50):
+        with atomic_writing(str(f1)) as f:
+            f.write(u'save %d' % i)
+        with io.open(f1, 'r') as f:
+            assert f.read() == u'save %d' % i
@@ -1,6 +1,8 @@
 import pytest
 import tornado
 
+from base64 import encodebytes
+
 from jupyter_server.services.contents.largefilemanager import LargeFileManager
 from ...conftest import expected_http_error
 
@@ -74,6 +76,48 @@ def test_saving_different_chunks(contents_manager):
             assert model_res['path'] == path
 
 
+def save_chunks(contents_manager, path, chunks):
+    """Save a list of byte strings to path as a chunked base64 upload."""
+    for i, data in enumerate(chunks, 1):
+        model = {
+            'type': 'file',
+            'format': 'base64',
+            'content': encodebytes(data).decode('ascii'),
+            'chunk': -1 if i == len(chunks) else i,
+        }
+        model_res = contents_manager.save(model, path)
+    return model_res
+
+
+def test_chunks_are_appended(contents_manager, tmp_path):
+    cm = contents_manager
+    chunks = [b'\xff' + bytes(range(255)), b'second', b'third']
+    model = save_chunks(cm, 'test.bin', chunks)
+    assert model['path'] == 'test.bin'
+    assert tmp_path.joinpath('test.bin').read_bytes() == b''.join(chunks)
+
+    # A new first chunk starts the file over.
+    save_chunks(cm, 'test.bin', [b'restarted', b'upload'])
+    assert tmp_path.joinpath('test.bin').read_bytes() == b'restartedupload'
+
+
+def test_mixed_format_chunks(contents_manager, tmp_path):
+    cm = contents_manager
+    # Text chunks are written UTF-8 encoded, base64 chunks as raw bytes.
+    models = [
+        {'chunk': 1, 'format': 'text', 'content': u'h\xe9llo '},
+        {'chunk': 2, 'format': 'base64',
+            'content': encodebytes(b'\x00\xff').decode('ascii')},
+        {'chunk': -1, 'format': 'text', 'content': u' w\xf6rld'},
+    ]
+    for model in models:
+        model['type'] = 'file'
+        cm.save(model, 'test.txt')
+
+    expected = u'h\xe9llo '.encode('utf-8') + b'\x00\xff' + u' w\xf6rld'.encode('utf-8')
+    assert tmp_path.joinpath('test.txt').read_bytes() == expected
+
+
 def test_save_in_subdirectory(contents_manager, tmp_path):
     cm = contents_manager
     sub_dir = tmp_path / 'foo'
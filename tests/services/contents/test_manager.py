@@ -390,6 +390,83 @@ def test_get(contents_manager):
         cm.get('foo', type='file')
 
 
+def test_get_dir_tracks_changes(contents_manager):
+    cm = contents_manager
+    _make_dir(cm, 'foo')
+
+    def listing():
+        return sorted(entry['name'] for entry in cm.get('foo')['content'])
+
+    assert listing() == []
+
+    # Each change below happens well within the directory's mtime
+    # resolution, so listings must never be served stale.
+    cm.new(path='foo/a.txt')
+    assert listing() == ['a.txt']
+
+    cm.new(path='foo/b.ipynb')
+    assert listing() == ['a.txt', 'b.ipynb']
+
+    cm.rename('foo/a.txt', 'foo/c.txt')
+    assert listing() == ['b.ipynb', 'c.txt']
+
+    cm.delete('foo/b.ipynb')
+    assert listing() == ['c.txt']
+
+    # Saving a file must be reflected in its directory entry.
+    model = {'type': 'file', 'format': 'text', 'content': u'new content'}
+    saved = cm.save(model, 'foo/c.txt')
+    entry, = cm.get('foo')['content']
+    assert entry['last_modified'] == saved['last_modified']
+    assert entry == cm.get('foo/c.txt', content=False)
+
+
+def test_get_tracks_external_changes(tmp_path):
+    cm = FileContentsManager(root_dir=str(tmp_path))
+    sub_dir = tmp_path / 'foo'
+    sub_dir.mkdir()
+
+    def listing():
+        return sorted(entry['name'] for entry in cm.get('foo')['content'])
+
+    assert listing() == []
+
+    # Changes made behind the manager's back, e.g. by a git pull or a
+    # running kernel, must show up in the next request.
+    sub_dir.joinpath('a.txt').write_text('a')
+    sub_dir.joinpath('bar').mkdir()
+    assert listing() == ['a.txt', 'bar']
+
+    sub_dir.joinpath('a.txt').rename(sub_dir / 'b.txt')
+    sub_dir.joinpath('bar').rmdir()
+    assert listing() == ['b.txt']
+
+    before = cm.get('foo/b.txt', content=False)
+    sub_dir.joinpath('b.txt').write_text('changed')
+    mtime = os.stat(str(sub_dir / 'b.txt')).st_mtime + 10
+    os.utime(str(sub_dir / 'b.txt'), (mtime, mtime))
+    after = cm.get('foo/b.txt', content=False)
+    assert after['last_modified'] > before['last_modified']
+    assert cm.get('foo/b.txt')['content'] == 'changed'
+    entry, = cm.get('foo')['content']
+    assert entry == after
+
+
+def test_get_dir_hidden_and_hide_globs(tmp_path):
+    cm = FileContentsManager(root_dir=str(tmp_path))
+    for name in ('visible.txt', '.hidden.txt', 'compiled.pyc', 'backup.txt~'):
+        tmp_path.joinpath(name).write_text(name)
+    tmp_path.joinpath('__pycache__').mkdir()
+    tmp_path.joinpath('.hidden_dir').mkdir()
+
+    names = sorted(entry['name'] for entry in cm.get('')['content'])
+    assert names == ['visible.txt']
+
+    cm.allow_hidden = True
+    names = sorted(entry['name'] for entry in cm.get('')['content'])
+    assert names == ['.hidden.txt', '.hidden_dir', 'visible.txt']
+
+
 def test_update(contents_manager):
     cm = contents_manager
     # Create a notebook.
@@ -467,6 +544,43 @@ def test_save(contents_manager):
     assert model['path'] == 'foo/Untitled.ipynb'
 
 
+def test_save_validates_changed_cell(contents_manager):
+    cm = contents_manager
+    nb, name, path = new_notebook(cm)
+    model = cm.save(cm.get(path), path)
+    assert 'message' not in model
+
+    # Break a single cell; saving must still flag the notebook as invalid
+    # even though the rest of it is unchanged since the last save.
+    full_model = cm.get(path)
+    full_model['content'].cells[0]['bad_key'] = 'not allowed'
+    model = cm.save(full_model, path)
+    assert 'validation failed' in model['message'].lower()
+
+    # Fixing the cell clears the message again.
+    nb = cm.get(path)['content']
+    del nb.cells[0]['bad_key']
+    model = cm.save({'type': 'notebook', 'content': nb}, path)
+    assert 'message' not in model
+
+
+def test_save_keeps_signature(contents_manager):
+    cm = contents_manager
+    nb, name, path = new_notebook(cm)
+    cm.trust_notebook(path)
+
+    # Editing one trusted cell re-signs the whole notebook on save.
+    full_model = cm.get(path)
+    full_model['content'].cells[0].source = "print('changed')"
+    cm.save(full_model, path)
+
+    nb = cm.get(path)['content']
+    assert nb.cells[0].source == "print('changed')"
+    for cell in nb.cells:
+        if cell.cell_type == 'code':
+            assert cell.metadata.trusted
+
+
 def test_delete(contents_manager):
     cm = contents_manager
     # Create a notebook
@@ -484,6 +598,28 @@ def test_delete(contents_manager):
         cm.get(path)
 
 
+def test_delete_non_empty_dir_permanently(tmp_path):
+    cm = FileContentsManager(root_dir=str(tmp_path), delete_to_trash=False)
+    make_populated_dir(cm, 'foo')
+    make_populated_dir(cm, 'foo/bar')
+
+    # Without the trash, non-empty directories are never removed.
+    with pytest.raises(HTTPError) as e:
+        cm.delete('foo')
+    assert expected_http_error(e, 400)
+    check_populated_dir_files(cm, 'foo')
+    check_populated_dir_files(cm, 'foo/bar')
+
+    # A directory holding nothing but leftover checkpoints counts as empty.
+    os.remove(cm._get_os_path('foo/bar/nb.ipynb'))
+    cm.delete('foo/bar/file.txt')
+    cp_dir = os.path.join(cm._get_os_path('foo/bar'), cm.checkpoints.checkpoint_dir)
+    assert os.listdir(cp_dir) == ['nb-checkpoint.ipynb']
+    cm.delete('foo/bar')
+    assert not cm.dir_exists('foo/bar')
+    check_populated_dir_files(cm, 'foo')
+
+
 def test_rename(contents_manager):
     cm = contents_manager
     # Create a new notebook
@@ -565,6 +701,102 @@ def test_copy(contents_manager):
     assert copy2['path'] == name
 
 
+def test_copy_is_independent(contents_manager):
+    cm = contents_manager
+    data = os.urandom(1024 * 1024)
+    os_path = cm._get_os_path('data.bin')
+    with open(os_path, 'wb') as f:
+        f.write(data)
+
+    copy = cm.copy('data.bin', 'copy.bin')
+    copy_os_path = cm._get_os_path(copy['path'])
+    with open(copy_os_path, 'rb') as f:
+        assert f.read() == data
+
+    # Writing to either file in place must not show through the other,
+    # so copies can never be hard links.
+    with open(copy_os_path, 'r+b') as f:
+        f.write(b'copy')
+    with open(os_path, 'rb') as f:
+        assert f.read() == data
+
+    with open(os_path, 'r+b') as f:
+        f.write(b'orig')
+    with open(copy_os_path, 'rb') as f:
+        assert f.read() == b'copy' + data[4:]
+
+
+def test_checkpoint_is_independent(contents_manager):
+    cm = contents_manager
+    data = os.urandom(1024)
+    os_path = cm._get_os_path('data.bin')
+    with open(os_path, 'wb') as f:
+        f.write(data)
+
+    checkpoint = cm.create_checkpoint('data.bin')
+    with open(os_path, 'r+b') as f:
+        f.write(b'changed')
+    cm.restore_checkpoint(checkpoint['id'], 'data.bin')
+    with open(os_path, 'rb') as f:
+        assert f.read() == data
+
+
+def test_copy_dir(contents_manager):
+    cm = contents_manager
+    make_populated_dir(cm, 'foo')
+    with pytest.raises(HTTPError) as e:
+        cm.copy('foo')
+    assert expected_http_error(e, 400)
+    with pytest.raises(HTTPError) as e:
+        cm.copy('foo', 'bar')
+    assert expected_http_error(e, 400)
+    assert not cm.dir_exists('bar')
+
+
+def test_checkpoints_with_identical_content(contents_manager):
+    cm = contents_manager
+    _make_dir(cm, 'foo')
+    paths = ['a.txt', 'foo/b.txt']
+
+    def save(path, text):
+        cm.save({'type': 'file', 'format': 'text', 'content': text}, path)
+
+    def read(path):
+        return cm.get(path)['content']
+
+    # Identical files get separate checkpoints.
+    for path in paths:
+        save(path, u'same content')
+    checkpoints = {path: cm.create_checkpoint(path) for path in paths}
+
+    for path in paths:
+        save(path, u'edited %s' % path)
+
+    # Restoring one file leaves the other alone.
+    cm.restore_checkpoint(checkpoints['a.txt']['id'], 'a.txt')
+    assert read('a.txt') == u'same content'
+    assert read('foo/b.txt') == u'edited foo/b.txt'
+
+    # Deleting one checkpoint leaves the other restorable.
+    cm.delete_checkpoint(checkpoints['a.txt']['id'], 'a.txt')
+    assert cm.list_checkpoints('a.txt') == []
+    cm.restore_checkpoint(checkpoints['foo/b.txt']['id'], 'foo/b.txt')
+    assert read('foo/b.txt') == u'same content'
+
+
+def test_restore_checkpoint_immediately(contents_manager):
+    cm = contents_manager
+    path = 'large.txt'
+    original = u'x' * (4 * 1024 * 1024)
+    cm.save({'type': 'file', 'format': 'text', 'content': original}, path)
+
+    # Restoring straight after creating must see the complete snapshot.
+    checkpoint = cm.create_checkpoint(path)
+    cm.save({'type': 'file', 'format': 'text', 'content': u'y'}, path)
+    cm.restore_checkpoint(checkpoint['id'], path)
+    assert cm.get(path)['content'] == original
+
+
 def test_mark_trusted_cells(contents_manager):
     cm = contents_manager
     nb, name, path = new_notebook(cm)
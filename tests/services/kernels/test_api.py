@@ -1,6 +1,7 @@
 import time
 import json
 import pytest
+import asyncio
 
 
 import tornado
@@ -8,6 +9,8 @@ import urllib.parse
 from tornado.escape import url_escape
 
 from jupyter_client.kernelspec import NATIVE_KERNEL_NAME
+from jupyter_client.jsonutil import date_default
+from jupyter_client.session import Session
 
 from jupyter_server.utils import url_path_join
 from ...conftest import expected_http_error
@@ -36,6 +39,70 @@ def ws_fetch(auth_header, http_port):
     return client_fetch
 
 
+async def start_kernel(fetch):
+    r = await fetch(
+        'api', 'kernels',
+        method='POST',
+        body=json.dumps({
+            'name': NATIVE_KERNEL_NAME
+        })
+    )
+    return json.loads(r.body)['id']
+
+
+def send_message(ws, msg_type, content=None, channel='shell'):
+    """Send a JSON message over a kernel websocket, returning its msg_id."""
+    msg = Session().msg(msg_type, content=content or {})
+    msg['channel'] = channel
+    ws.write_message(json.dumps(msg, default=date_default))
+    return msg['header']['msg_id']
+
+
+async def read_message(ws, timeout=30):
+    raw = await asyncio.wait_for(ws.read_message(), timeout)
+    return json.loads(raw)
+
+
+async def read_replies(ws, msg_id, timeout=30):
+    """Collect the messages sent in reply to msg_id.
+
+    Returns once both the shell reply and the kernel's return to idle on
+    iopub have arrived, since the two channels are not ordered.
+    """
+    replies = []
+    reply = idle = False
+    while not (reply and idle):
+        msg = await read_message(ws, timeout)
+        if msg['parent_header'].get('msg_id') != msg_id:
+            continue
+        replies.append(msg)
+        if msg['channel'] == 'shell':
+            reply = True
+        elif (msg['msg_type'] == 'status'
+                and msg['content']['execution_state'] == 'idle'):
+            idle = True
+    return replies
+
+
+async def wait_for_iopub(ws, attempts=30):
+    """Wait until iopub messages reach the websocket.
+
+    The iopub subscription takes a moment to be established, so output
+    sent right after connecting can otherwise be lost.
+    """
+    for i in range(attempts):
+        msg_id = send_message(ws, 'kernel_info_request')
+        try:
+            while True:
+                msg = await read_message(ws, timeout=1)
+                if (msg['channel'] == 'iopub'
+                        and msg['parent_header'].get('msg_id') == msg_id):
+                    return
+        except asyncio.TimeoutError:
+            continue
+    raise AssertionError('No iopub messages received')
+
+
 async def test_no_kernels(fetch):
     r = await fetch(
         'api', 'kernels',
@@ -246,6 +313,168 @@ async def test_connection(fetch, ws_fetch, http_port, auth_header):
     assert model['connections'] == 0
 
 
+async def test_kernel_info(fetch, ws_fetch):
+    kid = await start_kernel(fetch)
+    ws = await ws_fetch(
+        'api', 'kernels', kid, 'channels'
+    )
+    await wait_for_iopub(ws)
+    msg_id = send_message(ws, 'kernel_info_request')
+    replies = await read_replies(ws, msg_id)
+    reply, = [msg for msg in replies if msg['channel'] == 'shell']
+    assert reply['msg_type'] == 'kernel_info_reply'
+    assert reply['content']['status'] == 'ok'
+    assert reply['parent_header']['msg_id'] == msg_id
+    assert reply['buffers'] == []
+    assert all(msg['channel'] == 'iopub' for msg in replies if msg is not reply)
+    ws.close()
+
+
+async def test_stream_output(fetch, ws_fetch):
+    kid = await start_kernel(fetch)
+    ws = await ws_fetch(
+        'api', 'kernels', kid, 'channels'
+    )
+    await wait_for_iopub(ws)
+    msg_id = send_message(ws, 'execute_request', {
+        'code': 'for i in range(1000): print(i)',
+        'silent': False,
+        'store_history': False,
+        'user_expressions': {},
+        'allow_stdin': False,
+    })
+    replies = await read_replies(ws, msg_id)
+    streams = [msg['content'] for msg in replies if msg['msg_type'] == 'stream']
+    # However the output is batched, none of it is lost or reordered.
+    assert all(stream['name'] == 'stdout' for stream in streams)
+    text = ''.join(stream['text'] for stream in streams)
+    assert text == ''.join('%d\n' % i for i in range(1000))
+    ws.close()
+
+
+async def test_update_display_data(fetch, ws_fetch):
+    kid = await start_kernel(fetch)
+    ws = await ws_fetch(
+        'api', 'kernels', kid, 'channels'
+    )
+    await wait_for_iopub(ws)
+    msg_id = send_message(ws, 'execute_request', {
+        'code': '\n'.join([
+            'from IPython.display import display',
+            'handle = display(0, display_id=True)',
+            'for i in range(1, 100): handle.update(i)',
+        ]),
+        'silent': False,
+        'store_history': False,
+        'user_expressions': {},
+        'allow_stdin': False,
+    })
+    replies = await read_replies(ws, msg_id)
+    display, = [msg for msg in replies if msg['msg_type'] == 'display_data']
+    updates = [msg for msg in replies if msg['msg_type'] == 'update_display_data']
+    display_id = display['content']['transient']['display_id']
+    assert all(
+        msg['content']['transient']['display_id'] == display_id
+        for msg in updates
+    )
+    # The last update is always delivered.
+    assert updates[-1]['content']['data']['text/plain'] == '99'
+    ws.close()
+
+
+async def test_replay_buffered_messages(fetch, ws_fetch):
+    # How long the kernel keeps working after the client disconnects.
+    delay = 1
+    kid = await start_kernel(fetch)
+    ws = await ws_fetch(
+        'api', 'kernels', kid, 'channels',
+        params={'session_id': 'replay-session'}
+    )
+    await wait_for_iopub(ws)
+    msg_id = send_message(ws, 'execute_request', {
+        'code': 'import time; time.sleep(%d); print("done")' % delay,
+        'silent': False,
+        'store_history': False,
+        'user_expressions': {},
+        'allow_stdin': False,
+    })
+    # Disconnect once the kernel has started on the request.
+    while True:
+        msg = await read_message(ws)
+        if (msg['parent_header'].get('msg_id') == msg_id
+                and msg['msg_type'] == 'status'):
+            break
+    ws.close()
+    # give it some time to close on the other side:
+    for i in range(10):
+        r = await fetch(
+            'api', 'kernels', kid,
+            method='GET'
+        )
+        if json.loads(r.body)['connections'] == 0:
+            break
+        await asyncio.sleep(0.1)
+    assert json.loads(r.body)['connections'] == 0
+
+    # Output produced while disconnected is replayed on reconnect. Wait
+    # longer than the kernel's sleep so all of it has been buffered.
+    await asyncio.sleep(delay + 1)
+    ws = await ws_fetch(
+        'api', 'kernels', kid, 'channels',
+        params={'session_id': 'replay-session'}
+    )
+    replies = await read_replies(ws, msg_id)
+    streams = [msg['content'] for msg in replies if msg['msg_type'] == 'stream']
+    assert ''.join(stream['text'] for stream in streams) == 'done\n'
+    reply, = [msg for msg in replies if msg['channel'] == 'shell']
+    assert reply['content']['status'] == 'ok'
+    ws.close()
+
+
+async def test_connections_to_several_kernels(fetch, ws_fetch):
+    kids = [await start_kernel(fetch) for i in range(2)]
+    sockets = {}
+    for kid in kids:
+        sockets[kid] = await ws_fetch(
+            'api', 'kernels', kid, 'channels'
+        )
+        await wait_for_iopub(sockets[kid])
+
+    async def connections(kid):
+        r = await fetch(
+            'api', 'kernels', kid,
+            method='GET'
+        )
+        return json.loads(r.body)['connections']
+
+    assert [await connections(kid) for kid in kids] == [1, 1]
+
+    # Each kernel's output reaches its own socket.
+    msg_ids = {
+        kid: send_message(sockets[kid], 'execute_request', {
+            'code': 'print(%r)' % kid,
+            'silent': False,
+            'store_history': False,
+            'user_expressions': {},
+            'allow_stdin': False,
+        })
+        for kid in kids
+    }
+    for kid in kids:
+        replies = await read_replies(sockets[kid], msg_ids[kid])
+        streams = [msg['content'] for msg in replies if msg['msg_type'] == 'stream']
+        assert ''.join(stream['text'] for stream in streams) == kid + '\n'
+
+    # Closing one socket leaves the other connected.
+    sockets[kids[0]].close()
+    for i in range(10):
+        if await connections(kids[0]) == 0:
+            break
+        await asyncio.sleep(0.1)
+    assert [await connections(kid) for kid in kids] == [0, 1]
+    sockets[kids[1]].close()
+
+
 async def test_config2(serverapp):
     assert serverapp.kernel_manager.allowed_message_types == []
 
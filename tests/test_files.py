@@ -122,6 +122,85 @@ async def test_contents_manager(fetch, serverapp, root_dir):
     assert r.body.decode() == 'foobar'
 
 
+async def test_large_file(fetch, serverapp, root_dir):
+    # Larger than any sensible read chunk, and not a multiple of one.
+    data = os.urandom(5 * 1024 * 1024 + 17)
+    root_dir.joinpath('large.bin').write_bytes(data)
+
+    r = await fetch(
+        'files/large.bin',
+        method='GET'
+    )
+    assert r.code == 200
+    assert r.headers['content-type'] == 'application/octet-stream'
+    assert int(r.headers['content-length']) == len(data)
+    assert r.body == data
+
+
+async def test_if_modified_since(fetch, serverapp, root_dir):
+    path = root_dir.joinpath('test.txt')
+    path.write_text('foobar')
+
+    r = await fetch(
+        'files/test.txt',
+        method='GET'
+    )
+    last_modified = r.headers['Last-Modified']
+
+    # An unchanged file is not sent again.
+    r = await fetch(
+        'files/test.txt',
+        method='GET',
+        headers={'If-Modified-Since': last_modified},
+        raise_error=False
+    )
+    assert r.code == 304
+    assert r.body == b''
+
+    # A changed file is.
+    path.write_text('barfoo')
+    mtime = path.stat().st_mtime + 10
+    os.utime(str(path), (mtime, mtime))
+    r = await fetch(
+        'files/test.txt',
+        method='GET',
+        headers={'If-Modified-Since': last_modified},
+        raise_error=False
+    )
+    assert r.code == 200
+    assert r.body.decode() == 'barfoo'
+
+
+async def test_range(fetch, serverapp, root_dir):
+    data = os.urandom(1024)
+    root_dir.joinpath('test.bin').write_bytes(data)
+
+    r = await fetch(
+        'files/test.bin',
+        method='GET',
+        headers={'Range': 'bytes=100-199'}
+    )
+    assert r.code == 206
+    assert r.headers['Content-Range'] == 'bytes 100-199/1024'
+    assert r.body == data[100:200]
+
+    r = await fetch(
+        'files/test.bin',
+        method='GET',
+        headers={'Range': 'bytes=1000-'}
+    )
+    assert r.code == 206
+    assert r.body == data[1000:]
+
+    with pytest.raises(tornado.httpclient.HTTPClientError) as e:
+        await fetch(
+            'files/test.bin',
+            method='GET',
+            headers={'Range': 'bytes=2048-'}
+        )
+    assert expected_http_error(e, 416)
+
+
 async def test_download(fetch, serverapp, root_dir):
     text = 'hello'
     root_dir.joinpath('test.txt').write_text(text)
@@ -1,6 +1,9 @@
 """Test serialize/deserialize messages with buffers"""
 
 import os
+import copy
+import json
+import struct
 
 from jupyter_client.session import Session
 from jupyter_server.base.zmqhandlers import (
@@ -22,4 +25,41 @@ def test_deserialize_binary():
     msg['buffers'] = [ memoryview(os.urandom(2)) for i in range(3) ]
     bmsg = serialize_binary_message(msg)
     msg2 = deserialize_binary_message(bmsg)
-    assert msg2 == msg
\ No newline at end of file
+    assert msg2 == msg
+
+
+def test_serialize_binary_layout():
+    s = Session()
+    msg = s.msg('data_pub', content={'a': 'b'})
+    buffers = [os.urandom(n) for n in (0, 1, 1024)]
+    msg['buffers'] = [memoryview(b) for b in buffers]
+    before = copy.deepcopy(dict((k, v) for k, v in msg.items() if k != 'buffers'))
+    before_buffers = list(msg['buffers'])
+    bmsg = serialize_binary_message(msg)
+    # The input message is left untouched.
+    assert dict((k, v) for k, v in msg.items() if k != 'buffers') == before
+    assert len(msg['buffers']) == len(before_buffers)
+    assert all(a is b for a, b in zip(msg['buffers'], before_buffers))
+
+    # Wire format: frame count, frame offsets, then the JSON
+    # message followed by each buffer.
+    nbufs = struct.unpack('!I', bmsg[:4])[0]
+    assert nbufs == len(buffers) + 1
+    offsets = struct.unpack('!' + 'I' * nbufs, bmsg[4:4 * (nbufs + 1)])
+    assert offsets[0] == 4 * (nbufs + 1)
+    frames = [
+        bmsg[start:stop]
+        for start, stop in zip(offsets, list(offsets[1:]) + [len(bmsg)])
+    ]
+    assert json.loads(frames[0].decode('utf8'))['content'] == {'a': 'b'}
+    assert frames[1:] == buffers
+
+
+def test_deserialize_binary_large_buffers():
+    s = Session()
+    msg = s.msg('data_pub', content={'a': 'b'})
+    buffers = [os.urandom(1024 * 1024) for i in range(4)] + [b'']
+    msg['buffers'] = [memoryview(b) for b in buffers]
+    msg2 = deserialize_binary_message(serialize_binary_message(msg))
+    assert [bytes(b) for b in msg2['buffers']] == buffers
+    assert msg2['content'] == msg['content']